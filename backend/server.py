@@ -1,25 +1,38 @@
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from types import MappingProxyType
 from typing import List, Optional, Dict, Any
+import asyncio
+import hashlib
+import hmac
 import os
 import logging
+import time
 import uuid
 
+from cachetools import TLRUCache, TTLCache
 from dotenv import load_dotenv
 from fastapi import (
     FastAPI,
     APIRouter,
     Depends,
     HTTPException,
+    Request,
     status,
 )
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from motor.motor_asyncio import AsyncIOMotorClient
 from passlib.context import CryptContext
+from passlib.hash import bcrypt as bcrypt_handler
 from pydantic import BaseModel, Field, EmailStr, ConfigDict
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.cors import CORSMiddleware
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+import ahocorasick
+import orjson
 
 
 # ---------------------------------------------------------------------------
@@ -32,7 +45,16 @@ load_dotenv(ROOT_DIR / ".env")
 USE_MONGOMOCK = False
 try:
     mongo_url = os.environ["MONGO_URL"]
-    client = AsyncIOMotorClient(mongo_url, serverSelectionTimeoutMS=1000)
+    client = AsyncIOMotorClient(
+        mongo_url,
+        serverSelectionTimeoutMS=1000,
+        maxPoolSize=int(os.environ.get("MONGO_MAX_POOL", "200")),
+        minPoolSize=int(os.environ.get("MONGO_MIN_POOL", "10")),
+        maxIdleTimeMS=300000,
+        retryWrites=True,
+        compressors="zstd",
+        tz_aware=True,
+    )
     # Test connection
     db = client[os.environ["DB_NAME"]]
 except Exception as e:
@@ -46,6 +68,12 @@ except Exception as e:
 JWT_SECRET = os.environ.get("JWT_SECRET", "change_this_secret")
 JWT_ALGORITHM = os.environ.get("JWT_ALGORITHM", "HS256")
 JWT_EXPIRES_MINUTES = int(os.environ.get("JWT_EXPIRES_MINUTES", "120"))
+# bcrypt work factor for new hashes; existing hashes at other costs are
+# re-hashed on the next successful login.
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "10"))
+# Exposes POST /api/testplan, which runs a batch of API calls in one request.
+# Meant for test environments only.
+ENABLE_TEST_PLAN = os.environ.get("ENABLE_TEST_PLAN", "0") == "1"
 
 # Async wrapper for both motor and mongomock
 async def async_insert_one(collection, doc):
@@ -63,26 +91,56 @@ def async_find(collection, query):
         return collection.find(query)
     return collection.find(query)
 
+
+async def async_create_index(collection, keys, **kwargs):
+    if USE_MONGOMOCK:
+        return collection.create_index(keys, **kwargs)
+    return await collection.create_index(keys, **kwargs)
+
 # ---------------------------------------------------------------------------
 # App & Router
 # ---------------------------------------------------------------------------
-app = FastAPI(title="Student Skill Assistant API")
+app = FastAPI(title="Student Skill Assistant API", default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 
 # ---------------------------------------------------------------------------
 # Security / Auth helpers
 # ---------------------------------------------------------------------------
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Pin passlib to the native `bcrypt` package so a missing wheel fails loudly
+# at startup instead of silently degrading to a slower backend.
+bcrypt_handler.set_backend("bcrypt")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS,
+    bcrypt__ident="2b",
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+# Successful bcrypt verifications, keyed by an HMAC of (hash, password) so the
+# plaintext never sits in memory. Failures are never cached.
+_verify_cache: TTLCache = TTLCache(maxsize=4096, ttl=30)
 
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    key = hmac.new(
+        JWT_SECRET.encode(),
+        f"{hashed_password}:{plain_password}".encode(),
+        hashlib.sha256,
+    ).digest()
+    if _verify_cache.get(key):
+        return True
+
+    verified = await run_in_threadpool(pwd_context.verify, plain_password, hashed_password)
+    if verified:
+        _verify_cache[key] = True
+    return verified
+
+
+async def get_password_hash(password: str) -> str:
+    return await run_in_threadpool(pwd_context.hash, password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -104,17 +162,23 @@ async def get_student_by_email(email: str) -> Optional[Dict[str, Any]]:
         return db.students.find_one({"email": email})
 
 
-async def get_student_by_id(student_id: str) -> Optional[Dict[str, Any]]:
+# Fields needed to represent an authenticated student (no password hash).
+PUBLIC_PROJECTION = {"name": 1, "email": 1, "branch": 1, "semester": 1}
+
+
+async def get_student_by_id(
+    student_id: str, projection: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
     try:
         oid = ObjectId(student_id)
     except Exception:
         return None
     try:
         # Try async (motor) first
-        return await db.students.find_one({"_id": oid})
+        return await db.students.find_one({"_id": oid}, projection)
     except TypeError:
         # Fall back to sync (mongomock)
-        return db.students.find_one({"_id": oid})
+        return db.students.find_one({"_id": oid}, projection)
 
 
 class TokenData(BaseModel):
@@ -122,12 +186,30 @@ class TokenData(BaseModel):
     email: Optional[EmailStr] = None
 
 
+AUTH_CACHE_TTL = 30
+
+
+def _auth_cache_ttu(_key: bytes, value: tuple, now: float) -> float:
+    # Never keep an entry past the token's own `exp` claim.
+    _, exp = value
+    return now + min(AUTH_CACHE_TTL, exp - time.time())
+
+
+# sha256(token) -> (student document, token exp as a unix timestamp)
+_auth_cache: TLRUCache = TLRUCache(maxsize=10000, ttu=_auth_cache_ttu)
+
+
 async def get_current_student(token: str = Depends(oauth2_scheme)) -> Dict[str, Any]:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    cache_key = hashlib.sha256(token.encode()).digest()
+    cached = _auth_cache.get(cache_key)
+    if cached is not None:
+        return dict(cached[0])
+
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
         subject: str | None = payload.get("sub")
@@ -138,13 +220,14 @@ async def get_current_student(token: str = Depends(oauth2_scheme)) -> Dict[str,
     except JWTError:
         raise credentials_exception
 
-    student = await get_student_by_id(token_data.sub)
+    student = await get_student_by_id(token_data.sub, projection=PUBLIC_PROJECTION)
     if student is None:
         raise credentials_exception
 
     # normalize id to string for responses
     student["id"] = str(student["_id"])
-    return student
+    _auth_cache[cache_key] = (student, payload["exp"])
+    return dict(student)
 
 
 # ---------------------------------------------------------------------------
@@ -265,6 +348,26 @@ class ChatResponse(BaseModel):
     reply: str
 
 
+class TestPlanStep(BaseModel):
+    method: str = "GET"
+    path: str
+    body: Optional[Any] = None
+    auth: bool = True
+
+
+class TestPlanRequest(BaseModel):
+    steps: List[TestPlanStep] = Field(max_length=50)
+
+
+class TestPlanStepResult(BaseModel):
+    status: int
+    body: Optional[Any] = None
+
+
+class TestPlanResponse(BaseModel):
+    results: List[TestPlanStepResult]
+
+
 # ---------------------------------------------------------------------------
 # Static data: questions, courses, docs
 # ---------------------------------------------------------------------------
@@ -443,6 +546,33 @@ ML_QUESTIONS_FULL = [
 ]
 
 
+QUESTIONS: Dict[str, List[Dict[str, Any]]] = {
+    "webdev": WEBDEV_QUESTIONS_FULL,
+    "ml": ML_QUESTIONS_FULL,
+}
+
+# track -> {question id: correct option index}, used to grade submissions
+CORRECT_ANSWERS: Dict[str, Dict[str, int]] = {
+    track: {q["id"]: q["correctIndex"] for q in questions}
+    for track, questions in QUESTIONS.items()
+}
+
+# track -> serialized GET /tests/{track} body; the question banks never change
+# at runtime, so they are validated and encoded once.
+QUESTIONS_PUBLIC: Dict[str, bytes] = {
+    track: orjson.dumps(
+        {
+            "track": track,
+            "questions": [
+                QuestionPublic(id=q["id"], question=q["question"], options=q["options"]).model_dump()
+                for q in questions
+            ],
+        }
+    )
+    for track, questions in QUESTIONS.items()
+}
+
+
 COURSES: List[Dict[str, Any]] = [
     # Web Dev - Beginner
     {
@@ -604,6 +734,57 @@ DOC_CATEGORIES: List[Dict[str, Any]] = [
 ]
 
 
+# (track, difficulty) -> courses, grouped once for GET /recommendations
+RECOMMENDATIONS: Dict[tuple, List[Course]] = {}
+for _course in COURSES:
+    RECOMMENDATIONS.setdefault((_course["track"], _course["difficulty"]), []).append(Course(**_course))
+
+# Serialized GET /docs body; the doc tree is static.
+DOCS_RESPONSE: bytes = orjson.dumps(
+    DocsResponse(categories=[DocCategory(**cat) for cat in DOC_CATEGORIES]).model_dump()
+)
+
+
+# Chat replies in priority order; a rule fires when all of its keywords occur
+# in the (casefolded) message.
+CHAT_RULES: List[tuple] = [
+    (("html",), "HTML (HyperText Markup Language) defines the structure of web pages using elements like headings, paragraphs, links, and more. Start by learning the basic tags such as <h1>, <p>, <a>, and <div>."),
+    (("css",), "CSS (Cascading Style Sheets) is used to style HTML. Focus on selectors, the box model, flexbox, and grid to build responsive layouts."),
+    (("javascript",), "JavaScript makes your web pages interactive. Begin with variables, functions, arrays, objects, and DOM manipulation."),
+    (("js",), "JavaScript makes your web pages interactive. Begin with variables, functions, arrays, objects, and DOM manipulation."),
+    (("machine learning",), "Machine Learning is about learning patterns from data. Start with supervised learning (like regression and classification) before moving to deep learning."),
+    (("ml",), "Machine Learning is about learning patterns from data. Start with supervised learning (like regression and classification) before moving to deep learning."),
+    (("web", "development"), "For web development, master HTML, CSS, and JavaScript first, then explore a framework like React. Build small projects like a todo app or portfolio site."),
+]
+CHAT_DEFAULT_REPLY = "I am a simple assistant. In the future, I will be powered by a real ML model, but for now I can give short tips about HTML, CSS, JavaScript, and Machine Learning."
+
+# Single-pass matcher over every keyword used by CHAT_RULES.
+CHAT_MATCHER = ahocorasick.Automaton()
+for _keywords, _ in CHAT_RULES:
+    for _keyword in _keywords:
+        CHAT_MATCHER.add_word(_keyword, _keyword)
+CHAT_MATCHER.make_automaton()
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+# The static tables are built once at import and shared by every request;
+# freeze them so no handler can mutate module state by accident.
+QUESTIONS = _freeze(QUESTIONS)
+WEBDEV_QUESTIONS_FULL = QUESTIONS["webdev"]
+ML_QUESTIONS_FULL = QUESTIONS["ml"]
+CORRECT_ANSWERS = _freeze(CORRECT_ANSWERS)
+COURSES = _freeze(COURSES)
+DOC_CATEGORIES = _freeze(DOC_CATEGORIES)
+
+
 # ---------------------------------------------------------------------------
 # Utility functions
 # ---------------------------------------------------------------------------
@@ -617,14 +798,42 @@ def map_percentage_to_level(percentage: float) -> str:
     return "Advanced"
 
 
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+
+
+def static_json_response(request: Request, body: bytes, etag: str) -> Response:
+    """Serve a precomputed JSON body, or 304 if the client already has it."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers={"etag": etag})
+    return Response(content=body, media_type="application/json", headers={"etag": etag})
+
+
+# ETags for the precomputed bodies served through static_json_response.
+QUESTIONS_ETAG: Dict[str, str] = {track: _etag(body) for track, body in QUESTIONS_PUBLIC.items()}
+DOCS_ETAG = _etag(DOCS_RESPONSE)
+
+
 async def get_latest_levels_for_student(student_id: ObjectId) -> LevelsResponse:
-    levels: Dict[str, TrackLevel] = {}
-    cursor = db.test_results.find({"student_id": student_id}).sort("submitted_at", -1)
-    async for doc in cursor:
-        track = doc.get("track")
-        if track in levels:
-            continue
-        levels[track] = TrackLevel(level=doc.get("level"), percentage=doc.get("percentage"))
+    # One indexed point lookup per track, issued concurrently.
+    docs = await asyncio.gather(
+        *(
+            db.test_results.find_one(
+                {"student_id": student_id, "track": track},
+                {"level": 1, "percentage": 1},
+                sort=[("submitted_at", -1)],
+            )
+            for track in QUESTIONS
+        )
+    )
+    levels: Dict[str, TrackLevel] = {
+        track: TrackLevel(level=doc.get("level"), percentage=doc.get("percentage"))
+        for track, doc in zip(QUESTIONS, docs)
+        if doc is not None
+    }
 
     return LevelsResponse(webdev=levels.get("webdev"), ml=levels.get("ml"))
 
@@ -643,19 +852,13 @@ async def root() -> Dict[str, str]:
 @api_router.post("/status", response_model=StatusCheck)
 async def create_status_check(input: StatusCheckCreate):
     status_obj = StatusCheck(client_name=input.client_name)
-    doc = status_obj.model_dump()
-    doc["timestamp"] = doc["timestamp"].isoformat()
-    await db.status_checks.insert_one(doc)
+    await db.status_checks.insert_one(status_obj.model_dump())
     return status_obj
 
 
 @api_router.get("/status", response_model=List[StatusCheck])
 async def get_status_checks():
-    status_checks = await db.status_checks.find({}, {"_id": 0}).to_list(1000)
-    for check in status_checks:
-        if isinstance(check["timestamp"], str):
-            check["timestamp"] = datetime.fromisoformat(check["timestamp"])
-    return status_checks
+    return await db.status_checks.find({}, {"_id": 0}).to_list(1000)
 
 
 # ---------------------------- Auth Endpoints ------------------------------
@@ -663,20 +866,19 @@ async def get_status_checks():
 
 @api_router.post("/auth/register", response_model=StudentPublic, status_code=201)
 async def register_student(payload: StudentRegister):
-    existing = await get_student_by_email(payload.email)
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already registered")
-
-    hashed_password = get_password_hash(payload.password)
+    hashed_password = await get_password_hash(payload.password)
     doc = {
         "name": payload.name,
         "email": payload.email,
         "password_hash": hashed_password,
         "branch": payload.branch,
         "semester": payload.semester,
-        "created_at": datetime.now(timezone.utc).isoformat(),
+        "created_at": datetime.now(timezone.utc),
     }
-    result = await db.students.insert_one(doc)
+    try:
+        result = await db.students.insert_one(doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
     student_public = StudentPublic(
         id=str(result.inserted_id),
         name=payload.name,
@@ -690,9 +892,15 @@ async def register_student(payload: StudentRegister):
 @api_router.post("/auth/login", response_model=TokenResponse)
 async def login_student(payload: StudentLogin):
     student = await get_student_by_email(payload.email)
-    if not student or not verify_password(payload.password, student.get("password_hash", "")):
+    if not student or not await verify_password(payload.password, student.get("password_hash", "")):
         raise HTTPException(status_code=400, detail="Incorrect email or password")
 
+    if pwd_context.needs_update(student["password_hash"]):
+        new_hash = await get_password_hash(payload.password)
+        await db.students.update_one(
+            {"_id": student["_id"]}, {"$set": {"password_hash": new_hash}}
+        )
+
     student_id = str(student["_id"])
     access_token = create_access_token({"sub": student_id, "email": student["email"]})
     student_public = StudentPublic(
@@ -710,21 +918,18 @@ async def login_student(payload: StudentLogin):
 
 @api_router.get("/tests/levels", response_model=LevelsResponse)
 async def get_levels(current_student: Dict[str, Any] = Depends(get_current_student)):
-    student_id = ObjectId(current_student["id"])
+    student_id = current_student["_id"]
     return await get_latest_levels_for_student(student_id)
 
 
 @api_router.get("/tests/{track}", response_model=Dict[str, Any])
-async def get_test_questions(track: str, _: Dict[str, Any] = Depends(get_current_student)):
-    if track not in {"webdev", "ml"}:
+async def get_test_questions(
+    track: str, request: Request, _: Dict[str, Any] = Depends(get_current_student)
+):
+    if track not in QUESTIONS_PUBLIC:
         raise HTTPException(status_code=404, detail="Unknown track")
 
-    questions_full = WEBDEV_QUESTIONS_FULL if track == "webdev" else ML_QUESTIONS_FULL
-    questions_public = [
-        QuestionPublic(id=q["id"], question=q["question"], options=q["options"]).model_dump()
-        for q in questions_full
-    ]
-    return {"track": track, "questions": questions_public}
+    return static_json_response(request, QUESTIONS_PUBLIC[track], QUESTIONS_ETAG[track])
 
 
 @api_router.post("/tests/{track}", response_model=TestResultResponse)
@@ -733,33 +938,24 @@ async def submit_test(
     payload: TestSubmitRequest,
     current_student: Dict[str, Any] = Depends(get_current_student),
 ):
-    if track not in {"webdev", "ml"}:
+    if track not in QUESTIONS:
         raise HTTPException(status_code=404, detail="Unknown track")
 
-    questions_full = WEBDEV_QUESTIONS_FULL if track == "webdev" else ML_QUESTIONS_FULL
-    question_map = {q["id"]: q for q in questions_full}
-
-    score = 0
-    total = len(questions_full)
-
-    for ans in payload.answers:
-        q = question_map.get(ans.questionId)
-        if not q:
-            continue
-        if ans.optionIndex == q["correctIndex"]:
-            score += 1
+    correct = CORRECT_ANSWERS[track]
+    score = sum(1 for ans in payload.answers if correct.get(ans.questionId) == ans.optionIndex)
+    total = len(correct)
 
     percentage = (score / total) * 100 if total > 0 else 0.0
     level = map_percentage_to_level(percentage)
 
     doc = {
-        "student_id": ObjectId(current_student["id"]),
+        "student_id": current_student["_id"],
         "track": track,
         "score": score,
         "total": total,
         "percentage": percentage,
         "level": level,
-        "submitted_at": datetime.now(timezone.utc).isoformat(),
+        "submitted_at": datetime.now(timezone.utc),
     }
     await db.test_results.insert_one(doc)
 
@@ -786,17 +982,12 @@ async def submit_test(
 
 @api_router.get("/recommendations", response_model=RecommendationsResponse)
 async def get_recommendations(current_student: Dict[str, Any] = Depends(get_current_student)):
-    student_id = ObjectId(current_student["id"])
+    student_id = current_student["_id"]
     levels = await get_latest_levels_for_student(student_id)
 
     def filter_courses(track: str, level: Optional[TrackLevel]) -> List[Course]:
         target_difficulty = level.level if level and level.level else "Beginner"
-        filtered = [
-            Course(**course)
-            for course in COURSES
-            if course["track"] == track and course["difficulty"] == target_difficulty
-        ]
-        return filtered
+        return RECOMMENDATIONS.get((track, target_difficulty), [])
 
     return RecommendationsResponse(
         webdev=filter_courses("webdev", levels.webdev),
@@ -808,9 +999,8 @@ async def get_recommendations(current_student: Dict[str, Any] = Depends(get_curr
 
 
 @api_router.get("/docs", response_model=DocsResponse)
-async def get_docs(_: Dict[str, Any] = Depends(get_current_student)):
-    categories = [DocCategory(**cat) for cat in DOC_CATEGORIES]
-    return DocsResponse(categories=categories)
+async def get_docs(request: Request, _: Dict[str, Any] = Depends(get_current_student)):
+    return static_json_response(request, DOCS_RESPONSE, DOCS_ETAG)
 
 
 # ----------------------------- Chat Endpoint ------------------------------
@@ -818,24 +1008,106 @@ async def get_docs(_: Dict[str, Any] = Depends(get_current_student)):
 
 @api_router.post("/chat", response_model=ChatResponse)
 async def chat_endpoint(payload: ChatRequest, _: Dict[str, Any] = Depends(get_current_student)):
-    text = payload.message.lower()
-
-    if "html" in text:
-        reply = "HTML (HyperText Markup Language) defines the structure of web pages using elements like headings, paragraphs, links, and more. Start by learning the basic tags such as <h1>, <p>, <a>, and <div>."
-    elif "css" in text:
-        reply = "CSS (Cascading Style Sheets) is used to style HTML. Focus on selectors, the box model, flexbox, and grid to build responsive layouts."
-    elif "javascript" in text or "js" in text:
-        reply = "JavaScript makes your web pages interactive. Begin with variables, functions, arrays, objects, and DOM manipulation."
-    elif "machine learning" in text or "ml" in text:
-        reply = "Machine Learning is about learning patterns from data. Start with supervised learning (like regression and classification) before moving to deep learning."
-    elif "web" in text and "development" in text:
-        reply = "For web development, master HTML, CSS, and JavaScript first, then explore a framework like React. Build small projects like a todo app or portfolio site."
-    else:
-        reply = "I am a simple assistant. In the future, I will be powered by a real ML model, but for now I can give short tips about HTML, CSS, JavaScript, and Machine Learning."
+    text = payload.message.casefold()
+    found = {keyword for _, keyword in CHAT_MATCHER.iter(text)}
+    reply = next(
+        (rule_reply for keywords, rule_reply in CHAT_RULES if found.issuperset(keywords)),
+        CHAT_DEFAULT_REPLY,
+    )
 
     return ChatResponse(reply=reply)
 
 
+# ---------------------------- Test Plan Endpoint --------------------------
+
+
+async def dispatch_api_call(
+    method: str, path: str, body: Optional[Any], authorization: Optional[str]
+) -> TestPlanStepResult:
+    """Run one /api call through the ASGI app in-process and capture its response."""
+    path, _, query = path.lstrip("/").partition("?")
+    headers = [(b"content-type", b"application/json")]
+    if authorization:
+        headers.append((b"authorization", authorization.encode()))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method.upper(),
+        "scheme": "http",
+        "path": f"/api/{path}",
+        "raw_path": f"/api/{path}".encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": headers,
+        "client": None,
+        "server": None,
+    }
+    request_body = orjson.dumps(body) if body is not None else b""
+    response_status = 500
+    chunks: List[bytes] = []
+    body_sent = False
+    response_complete = asyncio.Event()
+
+    async def receive() -> Dict[str, Any]:
+        # Deliver the body once; later calls wait for the response to finish
+        # and then report a disconnect, as a real server would.
+        nonlocal body_sent
+        if body_sent:
+            await response_complete.wait()
+            return {"type": "http.disconnect"}
+        body_sent = True
+        return {"type": "http.request", "body": request_body, "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal response_status
+        if message["type"] == "http.response.start":
+            response_status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                response_complete.set()
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        # ServerErrorMiddleware has already sent the 500 response; it re-raises
+        # only so servers can log the error.
+        logger.exception("Test plan step %s %s failed", method, path)
+    finally:
+        response_complete.set()
+
+    raw = b"".join(chunks)
+    try:
+        response_body = orjson.loads(raw) if raw else None
+    except orjson.JSONDecodeError:
+        response_body = raw.decode(errors="replace")
+    return TestPlanStepResult(status=response_status, body=response_body)
+
+
+async def run_test_plan(plan: TestPlanRequest, request: Request):
+    authorization = request.headers.get("authorization")
+    results: List[TestPlanStepResult] = []
+    for step in plan.steps:
+        if step.path.lstrip("/").startswith("testplan"):
+            results.append(TestPlanStepResult(status=400, body={"detail": "Nested test plans are not allowed"}))
+            continue
+        result = await dispatch_api_call(
+            step.method, step.path, step.body, authorization if step.auth else None
+        )
+        # A successful login authenticates the remaining steps.
+        if isinstance(result.body, dict) and "access_token" in result.body:
+            authorization = f"Bearer {result.body['access_token']}"
+        results.append(result)
+    return TestPlanResponse(results=results)
+
+
+if ENABLE_TEST_PLAN:
+    api_router.add_api_route(
+        "/testplan", run_test_plan, methods=["POST"], response_model=TestPlanResponse
+    )
+
+
 # ---------------------------------------------------------------------------
 # Mount router, middleware, logging, shutdown
 # ---------------------------------------------------------------------------
@@ -843,10 +1115,17 @@ async def chat_endpoint(payload: ChatRequest, _: Dict[str, Any] = Depends(get_cu
 
 app.include_router(api_router)
 
+CORS_ORIGINS = frozenset(
+    origin.strip() for origin in os.environ.get("CORS_ORIGINS", "*").split(",") if origin.strip()
+)
+# A wildcard origin must not be combined with credentials; auth here is a
+# bearer header, so the wildcard case simply drops them.
+CORS_ALLOW_ALL = "*" in CORS_ORIGINS
+
 app.add_middleware(
     CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=os.environ.get("CORS_ORIGINS", "*").split(","),
+    allow_credentials=not CORS_ALLOW_ALL,
+    allow_origins=["*"] if CORS_ALLOW_ALL else CORS_ORIGINS,
     allow_methods=["*"],
     allow_headers=["*"],
 )
@@ -858,6 +1137,28 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@app.on_event("startup")
+async def ensure_indexes():
+    await async_create_index(db.students, "email", unique=True)
+    await async_create_index(db.test_results, [("student_id", 1), ("track", 1), ("submitted_at", -1)])
+
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
+
+
+# Local / single-host entry point. In production, run behind Gunicorn to
+# spread workers across cores:
+#   gunicorn server:app -k uvicorn.workers.UvicornWorker -w $(nproc) --preload
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        "server:app",
+        host=os.environ.get("HOST", "0.0.0.0"),
+        port=int(os.environ.get("PORT", "8001")),
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)),
+    )
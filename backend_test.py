@@ -1,72 +1,268 @@
 #!/usr/bin/env python3
 
+import numpy as np
 import requests
+import argparse
+import hashlib
+import os
+import socket
 import sys
 import json
-from datetime import datetime
-from typing import Dict, Any, Optional
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder/decoder
+    orjson = None
+
+
+def json_loads(data: bytes) -> Any:
+    """Decode a JSON response body straight from bytes"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Encode a request body once so it can be sent repeatedly as raw bytes"""
+    return orjson.dumps(obj) if orjson else json.dumps(obj).encode()
+
+
+def json_dumps_pretty(obj: Any) -> bytes:
+    """Encode the report as indented JSON bytes"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+
+DEFAULT_BASE_URL = "https://devskills-9.preview.emergentagent.com"
+REPORT_PATH = "/app/backend_test_report.json"
+# Per-test results, one JSON object per line, appended as each test finishes
+RESULTS_PATH = "/app/backend_test_report.jsonl"
+
+# SKILL_TEST_MODE=record saves every replayable response under REPLAY_DIR;
+# SKILL_TEST_MODE=replay serves saved responses without touching the network
+# (cache misses still go to the server). The default, live, does neither.
+TEST_MODE = os.environ.get("SKILL_TEST_MODE", "live")
+REPLAY_DIR = Path(os.environ.get("SKILL_TEST_CACHE_DIR", ".cache"))
+
+
+class RecordedResponse:
+    """The subset of requests.Response that run_test reads, loaded from disk"""
+
+    def __init__(self, status_code: int, content_type: str, text: str):
+        self.status_code = status_code
+        self.headers = {'content-type': content_type}
+        self.text = text
+        self.content = text.encode()
+
 
 class StudentSkillAssistantTester:
-    def __init__(self, base_url="https://devskills-9.preview.emergentagent.com"):
+    # Result columns grow in blocks of this many rows
+    RESULTS_CHUNK = 1024
+    # (connect, read) timeouts: fail fast on dead hosts, allow slow responses
+    DEFAULT_TIMEOUT = (2.0, 10.0)
+
+    # Option every question is answered with on submit: all 0 for WebDev for
+    # simplicity, all 1 for ML for variety
+    SUBMIT_OPTION = {"webdev": 0, "ml": 1}
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, tty: bool = False, worker_id: int = 0,
+                 results_path: Optional[str] = None):
         self.base_url = base_url
+        # Distinguishes students registered by concurrent tester processes
+        self.worker_id = worker_id
         self.api_url = f"{base_url}/api"
         self.token = None
         self.student_data = None
-        self.tests_run = 0
-        self.tests_passed = 0
-        self.test_results = []
+        # Results are stored column-wise; rows are only assembled into dicts
+        # when the report is built.
+        self._n = 0
+        self._results_name: list = []
+        self._results_details: list = []
+        self._results_success = np.zeros(self.RESULTS_CHUNK, dtype=bool)
+        self._results_t_ns = np.zeros(self.RESULTS_CHUNK, dtype=np.int64)
+        # With a results_path, each result is streamed to JSONL as it is
+        # logged instead of being kept in memory for the report.
+        self.results_path = results_path
+        self._results_fh = open(results_path, 'w', buffering=1) if results_path else None
+        self._log_lock = threading.Lock()
+        # Progress lines are buffered and written once at the end of the run,
+        # unless tty is set for live output.
+        self.tty = tty
+        self._log_buf = deque()
+        # Results record a monotonic offset; wall-clock timestamps are derived
+        # from this anchor only when the report is built.
+        self._t0_wall = datetime.now()
+        self._t0_mono = time.perf_counter_ns()
+        # track -> question ids from GET tests/{track}, reused by the submit tests
+        self._question_ids: Dict[str, list] = {}
+        # track -> ready-to-send submit body, built once from the cached questions
+        self._submit_payloads: Dict[str, Dict] = {}
+        # Same payloads pre-encoded, so repeated sends skip JSON encoding
+        self._submit_bodies: Dict[str, bytes] = {}
+        self._chat_body = json_dumps({"message": "html"})
+
+        # One keep-alive session for the whole run so every request after the
+        # first reuses the same TCP/TLS connection.
+        self.session = requests.Session()
+        self.session.headers.update({'Content-Type': 'application/json'})
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                connect=2,
+                read=2,
+                backoff_factor=0.3,
+                backoff_jitter=0.2,
+                status_forcelist=[502, 503, 504],
+                # POST is left out: a retried register/submit could be applied twice
+                allowed_methods=frozenset(['HEAD', 'GET', 'PUT', 'DELETE']),
+                raise_on_status=False,
+            ),
+        )
+        # --base-url may point at a plain-http server (e.g. a local load run),
+        # which needs the same pooling and retries
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Resolve DNS and open the first TLS connection in the background so
+        # the handshake overlaps with setup instead of the first test.
+        if TEST_MODE != "replay":
+            self._warm = threading.Thread(target=self._warm_connection, daemon=True)
+            self._warm.start()
+
+    def _warm_connection(self):
+        """Best-effort connection priming; any failure is left for the real tests to report"""
+        try:
+            parsed = urlparse(self.base_url)
+            socket.getaddrinfo(parsed.hostname, parsed.port or (443 if parsed.scheme == "https" else 80))
+            self.session.head(self.base_url, timeout=5)
+        except Exception:
+            pass
 
     def log_test(self, name: str, success: bool, details: str = ""):
         """Log test result"""
-        self.tests_run += 1
-        if success:
-            self.tests_passed += 1
-        
-        result = {
-            "test_name": name,
-            "success": success,
-            "details": details,
-            "timestamp": datetime.now().isoformat()
-        }
-        self.test_results.append(result)
-        
+        t_ns = time.perf_counter_ns() - self._t0_mono
         status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} - {name}")
-        if details:
-            print(f"    {details}")
 
-    def run_test(self, name: str, method: str, endpoint: str, expected_status: int, 
-                 data: Optional[Dict] = None, headers: Optional[Dict] = None) -> tuple[bool, Dict]:
-        """Run a single API test"""
+        with self._log_lock:
+            n = self._n
+            if n == len(self._results_success):
+                self._results_success = np.resize(self._results_success, n + self.RESULTS_CHUNK)
+                self._results_t_ns = np.resize(self._results_t_ns, n + self.RESULTS_CHUNK)
+            self._results_success[n] = success
+            self._results_t_ns[n] = t_ns
+            self._n = n + 1
+            if self._results_fh:
+                self._results_fh.write(json_dumps({
+                    "test_name": name,
+                    "success": success,
+                    "details": details,
+                    "timestamp": self._timestamp(t_ns)
+                }).decode() + "\n")
+            else:
+                self._results_name.append(name)
+                self._results_details.append(details)
+
+            self.emit(f"{status} - {name}")
+            if details:
+                self.emit(f"    {details}")
+
+    def _timestamp(self, t_ns: int) -> str:
+        """Wall-clock ISO timestamp for a monotonic offset"""
+        return (self._t0_wall + timedelta(microseconds=t_ns / 1000)).isoformat()
+
+    def close(self):
+        """Release the HTTP session and the streamed results file"""
+        self.session.close()
+        if self._results_fh:
+            self._results_fh.close()
+
+    def emit(self, line: str):
+        """Print a progress line now (tty) or buffer it for flush_log"""
+        if self.tty:
+            print(line)
+        else:
+            self._log_buf.append(f"{line}\n")
+
+    def flush_log(self):
+        """Write all buffered progress lines in one call"""
+        sys.stdout.write(''.join(self._log_buf))
+        sys.stdout.flush()
+        self._log_buf.clear()
+
+    def run_parallel(self, tests):
+        """Run independent tests concurrently; they share the session's connection pool"""
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            return list(executor.map(lambda test: test(), tests))
+
+    def send(self, method: str, endpoint: str, data: Optional[Union[Dict, bytes]] = None,
+             headers: Optional[Dict] = None, replayable: bool = True, timeout: Optional[tuple] = None):
+        """Issue a request, honouring SKILL_TEST_MODE record/replay for replayable calls.
+
+        data may be a dict (encoded per call) or pre-encoded JSON bytes (sent as-is).
+        """
         url = f"{self.api_url}/{endpoint}"
-        
-        # Default headers
-        req_headers = {'Content-Type': 'application/json'}
-        if self.token:
-            req_headers['Authorization'] = f'Bearer {self.token}'
-        if headers:
-            req_headers.update(headers)
+        # The session already sends Content-Type: application/json for raw bodies
+        body = {'data': data} if isinstance(data, (bytes, bytearray)) else {'json': data}
+        timeout = timeout or self.DEFAULT_TIMEOUT
+        if TEST_MODE == "live" or not replayable:
+            return self.session.request(method, url, headers=headers, timeout=timeout, **body)
+
+        # Authenticated and anonymous calls to the same endpoint must not share a recording
+        authed = bool({**self.session.headers, **(headers or {})}.get('Authorization'))
+        key = hashlib.sha1(
+            f"{method}|{endpoint}|{authed}|{self._replay_body_key(data)}".encode()
+        ).hexdigest()
+        path = REPLAY_DIR / f"{key}.json"
+        if TEST_MODE == "replay" and path.exists():
+            recorded = json_loads(path.read_bytes())
+            return RecordedResponse(recorded["status"], recorded["content_type"], recorded["body"])
+
+        response = self.session.request(method, url, headers=headers, timeout=timeout, **body)
+        if TEST_MODE == "record":
+            REPLAY_DIR.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(json_dumps_pretty({
+                "status": response.status_code,
+                "content_type": response.headers.get('content-type', ''),
+                "body": response.text,
+            }))
+        return response
+
+    @staticmethod
+    def _replay_body_key(data: Optional[Union[Dict, bytes]]) -> str:
+        """Canonical form of a request body for the replay key"""
+        if isinstance(data, (bytes, bytearray)):
+            data = json_loads(data)
+        return json.dumps(data or {}, sort_keys=True)
 
+    def run_test(self, name: str, method: str, endpoint: str, expected_status: int, 
+                 data: Optional[Union[Dict, bytes]] = None, headers: Optional[Dict] = None,
+                 parse_body: bool = True, replayable: bool = True,
+                 timeout: Optional[tuple] = None) -> tuple[bool, Dict]:
+        """Run a single API test; pass parse_body=False when the caller ignores the body
+        and replayable=False when the call must always reach the server"""
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=req_headers, timeout=10)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=req_headers, timeout=10)
-            elif method == 'PUT':
-                response = requests.put(url, json=data, headers=req_headers, timeout=10)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=req_headers, timeout=10)
-            else:
-                self.log_test(name, False, f"Unsupported method: {method}")
-                return False, {}
+            response = self.send(method, endpoint, data, headers, replayable, timeout)
 
             success = response.status_code == expected_status
             response_data = {}
-            
-            try:
-                response_data = response.json()
-            except:
-                response_data = {"raw_response": response.text}
+            if parse_body:
+                if 'json' in response.headers.get('content-type', ''):
+                    response_data = json_loads(response.content)
+                elif not success:
+                    response_data = {"raw_response": response.text[:200]}
 
             details = f"Status: {response.status_code} (expected {expected_status})"
             if not success:
@@ -81,25 +277,32 @@ class StudentSkillAssistantTester:
 
     def test_health_check(self):
         """Test basic API health"""
-        return self.run_test("API Health Check", "GET", "", 200)
+        # A healthy endpoint answers well under a second
+        return self.run_test("API Health Check", "GET", "", 200, parse_body=False, timeout=(2.0, 3.0))
 
-    def test_register_student(self):
-        """Test student registration"""
-        timestamp = datetime.now().strftime("%H%M%S")
-        test_student = {
+    def new_student_data(self) -> Dict[str, str]:
+        """Build a registration payload with a unique email"""
+        timestamp = datetime.now().strftime("%H%M%S%f") + str(self.worker_id)
+        return {
             "name": f"Test Student {timestamp}",
             "email": f"test{timestamp}@college.edu",
             "password": "TestPass123!",
             "branch": "CSE",
             "semester": "5"
         }
+
+    def test_register_student(self):
+        """Test student registration"""
+        test_student = self.new_student_data()
         
         success, response = self.run_test(
             "Student Registration", 
             "POST", 
             "auth/register", 
             201, 
-            test_student
+            test_student,
+            parse_body=False,
+            replayable=False
         )
         
         if success:
@@ -123,62 +326,88 @@ class StudentSkillAssistantTester:
             "POST",
             "auth/login",
             200,
-            login_data
+            login_data,
+            replayable=False
         )
         
         if success and 'access_token' in response:
-            self.token = response['access_token']
+            self.set_token(response['access_token'])
             return True
         return False
 
+    def set_token(self, token: str):
+        """Authenticate all subsequent session requests"""
+        self.token = token
+        self.session.headers['Authorization'] = f'Bearer {token}'
+
     def test_get_levels(self):
         """Test getting student levels"""
         return self.run_test("Get Student Levels", "GET", "tests/levels", 200)
 
+    def fetch_questions(self, name: str, track: str) -> tuple[bool, Dict]:
+        """GET a track's questions and cache the payload for the submit tests"""
+        success, response = self.run_test(name, "GET", f"tests/{track}", 200)
+        if success and 'questions' in response:
+            self.cache_questions(track, response)
+        return success, response
+
+    def cache_questions(self, track: str, response: Dict):
+        """Keep a track's question ids and precompute its submit payload"""
+        self._question_ids[track] = list(map(itemgetter('id'), response['questions']))
+        self._submit_payloads[track] = self.build_answers(self._question_ids[track], self.SUBMIT_OPTION[track])
+        self._submit_bodies[track] = json_dumps(self._submit_payloads[track])
+
+    def submit_payload(self, name: str, track: str, encoded: bool = False) -> Optional[Union[Dict, bytes]]:
+        """Return the prebuilt submit payload (as JSON bytes if encoded), fetching the questions only if missing"""
+        if track not in self._submit_payloads:
+            success, response = self.fetch_questions(name, track)
+            if not success or 'questions' not in response:
+                return None
+        return self._submit_bodies[track] if encoded else self._submit_payloads[track]
+
+    @staticmethod
+    def build_answers(question_ids: list, option_index: int) -> Dict:
+        """Answer every question with the same option"""
+        return {"answers": [{"questionId": qid, "optionIndex": option_index} for qid in question_ids]}
+
     def test_get_webdev_questions(self):
         """Test getting web development test questions"""
-        return self.run_test("Get WebDev Questions", "GET", "tests/webdev", 200)
+        return self.fetch_questions("Get WebDev Questions", "webdev")
 
     def test_get_ml_questions(self):
         """Test getting ML test questions"""
-        return self.run_test("Get ML Questions", "GET", "tests/ml", 200)
+        return self.fetch_questions("Get ML Questions", "ml")
 
     def test_submit_webdev_test(self):
         """Test submitting web development test"""
-        # Get questions first
-        success, response = self.run_test("Get WebDev Questions for Test", "GET", "tests/webdev", 200)
-        if not success or 'questions' not in response:
+        # Reuse the payload prepared by test_get_webdev_questions
+        payload = self.submit_payload("Get WebDev Questions for Test", "webdev", encoded=True)
+        if payload is None:
             return False
             
-        questions = response['questions']
-        # Submit answers (all option 0 for simplicity)
-        answers = [{"questionId": q["id"], "optionIndex": 0} for q in questions]
-        
         return self.run_test(
             "Submit WebDev Test",
             "POST",
             "tests/webdev",
             200,
-            {"answers": answers}
+            payload,
+            parse_body=False
         )
 
     def test_submit_ml_test(self):
         """Test submitting ML test"""
-        # Get questions first
-        success, response = self.run_test("Get ML Questions for Test", "GET", "tests/ml", 200)
-        if not success or 'questions' not in response:
+        # Reuse the payload prepared by test_get_ml_questions
+        payload = self.submit_payload("Get ML Questions for Test", "ml", encoded=True)
+        if payload is None:
             return False
             
-        questions = response['questions']
-        # Submit answers (all option 1 for variety)
-        answers = [{"questionId": q["id"], "optionIndex": 1} for q in questions]
-        
         return self.run_test(
             "Submit ML Test",
             "POST",
             "tests/ml",
             200,
-            {"answers": answers}
+            payload,
+            parse_body=False
         )
 
     def test_get_recommendations(self):
@@ -191,53 +420,170 @@ class StudentSkillAssistantTester:
 
     def test_chat_endpoint(self):
         """Test chat functionality"""
-        chat_data = {"message": "html"}
-        return self.run_test("Chat with HTML query", "POST", "chat", 200, chat_data)
+        return self.run_test("Chat with HTML query", "POST", "chat", 200, self._chat_body)
 
     def test_unauthorized_access(self):
         """Test unauthorized access handling"""
-        # Temporarily remove token
-        original_token = self.token
-        self.token = None
-        
-        success, _ = self.run_test("Unauthorized Access Test", "GET", "tests/levels", 401)
-        
-        # Restore token
-        self.token = original_token
+        # A None header value makes requests drop the session's Authorization
+        # for this call only, without touching shared session state
+        success, _ = self.run_test("Unauthorized Access Test", "GET", "tests/levels", 401,
+                                   headers={'Authorization': None}, parse_body=False)
         return success
 
-    def run_all_tests(self):
-        """Run comprehensive test suite"""
-        print("🚀 Starting Student Skill Assistant API Tests")
-        print(f"📍 Testing against: {self.base_url}")
-        print("=" * 60)
-        
+    def supports_test_plan(self) -> bool:
+        """Check whether the server exposes the batched /testplan endpoint"""
+        if TEST_MODE != "live":
+            # Record/replay works per request, so keep to the serial flow
+            return False
+        try:
+            response = self.session.head(f"{self.api_url}/testplan", timeout=5)
+        except Exception:
+            return False
+        # The route is POST-only, so only an enabled endpoint answers HEAD with
+        # 405; a 404, an auth error or a 5xx all mean the serial flow is safer
+        return response.status_code == 405
+
+    def run_test_plan(self, steps: list) -> Optional[list]:
+        """Send a batch of steps to /testplan in one request and log each step's result"""
+        payload = {
+            "steps": [
+                {key: step[key] for key in ("method", "path", "body", "auth") if key in step}
+                for step in steps
+            ]
+        }
+        try:
+            response = self.session.post(f"{self.api_url}/testplan", json=payload, timeout=(2.0, 30.0))
+        except Exception as e:
+            self.emit(f"⚠️  Test plan request failed: {str(e)}")
+            return None
+        if response.status_code != 200:
+            self.emit(f"⚠️  Test plan request failed: Status: {response.status_code}, Response: {response.text[:200]}")
+            return None
+
+        try:
+            step_results = json_loads(response.content)["results"]
+        except Exception as e:
+            self.emit(f"⚠️  Test plan returned a malformed response: {str(e)}")
+            return None
+        if not isinstance(step_results, list) or len(step_results) != len(steps):
+            self.emit(f"⚠️  Test plan returned a short response for {len(steps)} steps: {str(step_results)[:200]}")
+            return None
+
+        results = []
+        for step, result in zip(steps, step_results):
+            success = result["status"] == step["expected_status"]
+            details = f"Status: {result['status']} (expected {step['expected_status']})"
+            if not success:
+                details += f", Response: {str(result['body'])[:200]}"
+            self.log_test(step["name"], success, details)
+            results.append((success, result["body"] if isinstance(result["body"], dict) else {}))
+        return results
+
+    def run_planned_tests(self) -> bool:
+        """Run the suite as two /testplan batches instead of one request per test
+
+        Returns False if the first batch could not be run, so the caller can
+        fall back to the serial flow.
+        """
+        student = self.new_student_data()
+        results = self.run_test_plan([
+            {"name": "API Health Check", "expected_status": 200, "method": "GET", "path": ""},
+            {"name": "Student Registration", "expected_status": 201, "method": "POST",
+             "path": "auth/register", "body": student},
+            {"name": "Student Login", "expected_status": 200, "method": "POST", "path": "auth/login",
+             "body": {"email": student["email"], "password": student["password"]}},
+            {"name": "Get Student Levels", "expected_status": 200, "method": "GET", "path": "tests/levels"},
+            {"name": "Get WebDev Questions", "expected_status": 200, "method": "GET", "path": "tests/webdev"},
+            {"name": "Get ML Questions", "expected_status": 200, "method": "GET", "path": "tests/ml"},
+        ])
+        if results is None:
+            return False
+        if not results[1][0]:
+            self.emit("❌ Registration failed, skipping all auth-dependent tests")
+            return True
+        self.student_data = student
+        login_ok, login_response = results[2]
+        if not (login_ok and 'access_token' in login_response):
+            self.emit("❌ Login failed, skipping protected endpoint tests")
+            return True
+        self.set_token(login_response['access_token'])
+        for track, (ok, response) in zip(("webdev", "ml"), results[4:6]):
+            if ok and 'questions' in response:
+                self.cache_questions(track, response)
+
+        steps = []
+        for name, fetch_name, track in (
+            ("Submit WebDev Test", "Get WebDev Questions for Test", "webdev"),
+            ("Submit ML Test", "Get ML Questions for Test", "ml"),
+        ):
+            payload = self.submit_payload(fetch_name, track)
+            if payload is not None:
+                steps.append({"name": name, "expected_status": 200, "method": "POST", "path": f"tests/{track}",
+                              "body": payload})
+        steps += [
+            {"name": "Get Recommendations", "expected_status": 200, "method": "GET", "path": "recommendations"},
+            {"name": "Get Documentation", "expected_status": 200, "method": "GET", "path": "docs"},
+            {"name": "Chat with HTML query", "expected_status": 200, "method": "POST", "path": "chat",
+             "body": {"message": "html"}},
+            {"name": "Unauthorized Access Test", "expected_status": 401, "method": "GET",
+             "path": "tests/levels", "auth": False},
+        ]
+        if self.run_test_plan(steps) is None:
+            # Registration and login already went through, so finish the
+            # remaining tests one request at a time with the same student
+            self.emit("⚠️  Test plan batch failed, running the remaining tests serially")
+            self.run_serial_followup_tests()
+        return True
+
+    def run_serial_tests(self):
+        """Run the suite with one HTTP request per test"""
         # Basic health check
         self.test_health_check()
         
         # Auth flow
         if self.test_register_student():
             if self.test_login_student():
-                # Protected endpoints (require auth)
-                self.test_get_levels()
-                self.test_get_webdev_questions()
-                self.test_get_ml_questions()
-                
-                # Test submissions
-                self.test_submit_webdev_test()
-                self.test_submit_ml_test()
-                
-                # Other protected endpoints
-                self.test_get_recommendations()
-                self.test_get_docs()
-                self.test_chat_endpoint()
-                
-                # Test unauthorized access
-                self.test_unauthorized_access()
+                self.run_serial_protected_tests()
             else:
-                print("❌ Login failed, skipping protected endpoint tests")
+                self.emit("❌ Login failed, skipping protected endpoint tests")
         else:
-            print("❌ Registration failed, skipping all auth-dependent tests")
+            self.emit("❌ Registration failed, skipping all auth-dependent tests")
+
+    def run_serial_protected_tests(self):
+        """Run the tests that need a logged-in student, one HTTP request per test"""
+        # Protected endpoints (require auth)
+        self.run_parallel([
+            self.test_get_levels,
+            self.test_get_webdev_questions,
+            self.test_get_ml_questions,
+        ])
+        self.run_serial_followup_tests()
+
+    def run_serial_followup_tests(self):
+        """Run the submissions and the tests that depend on them, one HTTP request per test"""
+        # Test submissions
+        self.test_submit_webdev_test()
+        self.test_submit_ml_test()
+        
+        # Other protected endpoints (recommendations depend on the submissions above)
+        self.run_parallel([
+            self.test_get_recommendations,
+            self.test_get_docs,
+            self.test_chat_endpoint,
+        ])
+        
+        # Test unauthorized access
+        self.test_unauthorized_access()
+
+    def run_all_tests(self):
+        """Run comprehensive test suite"""
+        print("🚀 Starting Student Skill Assistant API Tests")
+        print(f"📍 Testing against: {self.base_url}")
+        print("=" * 60)
+
+        if not (self.supports_test_plan() and self.run_planned_tests()):
+            self.run_serial_tests()
+        self.flush_log()
         
         # Print summary
         print("\n" + "=" * 60)
@@ -250,29 +596,112 @@ class StudentSkillAssistantTester:
             print(f"⚠️  {self.tests_run - self.tests_passed} tests failed")
             return 1
 
+    @property
+    def tests_run(self) -> int:
+        return self._n
+
+    @property
+    def tests_passed(self) -> int:
+        return int(self._results_success[:self._n].sum())
+
     def get_test_report(self):
         """Get detailed test report"""
-        return {
+        n = self._n
+        tests_passed = self.tests_passed
+        report = {
             "summary": {
-                "total_tests": self.tests_run,
-                "passed_tests": self.tests_passed,
-                "failed_tests": self.tests_run - self.tests_passed,
-                "success_rate": (self.tests_passed / self.tests_run * 100) if self.tests_run > 0 else 0
+                "total_tests": n,
+                "passed_tests": tests_passed,
+                "failed_tests": n - tests_passed,
+                "success_rate": (tests_passed / n * 100) if n > 0 else 0
             },
-            "test_results": self.test_results,
             "timestamp": datetime.now().isoformat()
         }
+        if self.results_path:
+            report["results_file"] = self.results_path
+        else:
+            report["test_results"] = [
+                {
+                    "test_name": name,
+                    "success": success,
+                    "details": details,
+                    "timestamp": self._timestamp(t_ns)
+                }
+                for name, success, details, t_ns in zip(
+                    self._results_name,
+                    self._results_success[:n].tolist(),
+                    self._results_details,
+                    self._results_t_ns[:n].tolist(),
+                )
+            ]
+        return report
+
+def run_tester(base_url: str, tty: bool = False, worker_id: int = 0,
+               results_path: Optional[str] = None) -> tuple[int, Dict]:
+    """Run the full suite with one tester and return its exit code and report"""
+    tester = StudentSkillAssistantTester(base_url, tty=tty, worker_id=worker_id, results_path=results_path)
+    try:
+        exit_code = tester.run_all_tests()
+    finally:
+        tester.close()
+    return exit_code, tester.get_test_report()
+
+
+def _run_worker(args: tuple) -> tuple[int, Dict]:
+    """multiprocessing.Pool entry point: args is (worker_id, base_url, tty, results_path)"""
+    worker_id, base_url, tty, results_path = args
+    return run_tester(base_url, tty=tty, worker_id=worker_id, results_path=results_path)
+
+
+def merge_reports(reports: list) -> Dict:
+    """Combine per-worker reports into one summary with all results"""
+    total = sum(r["summary"]["total_tests"] for r in reports)
+    passed = sum(r["summary"]["passed_tests"] for r in reports)
+    merged = {
+        "summary": {
+            "total_tests": total,
+            "passed_tests": passed,
+            "failed_tests": total - passed,
+            "success_rate": (passed / total * 100) if total > 0 else 0,
+            "workers": len(reports)
+        },
+        "timestamp": datetime.now().isoformat()
+    }
+    results_files = [r["results_file"] for r in reports if "results_file" in r]
+    if results_files:
+        merged["results_files"] = results_files
+    else:
+        merged["test_results"] = [result for r in reports for result in r["test_results"]]
+    return merged
+
 
 def main():
-    tester = StudentSkillAssistantTester()
-    exit_code = tester.run_all_tests()
+    parser = argparse.ArgumentParser(description="Student Skill Assistant API tests")
+    parser.add_argument("--tty", action="store_true", help="print each result as it happens instead of at the end")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="server to test against")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="run N independent testers in parallel processes, each with its own student")
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        with multiprocessing.Pool(args.workers) as pool:
+            outcomes = pool.map(_run_worker, [
+                (i, args.base_url, args.tty, RESULTS_PATH.replace(".jsonl", f".{i}.jsonl"))
+                for i in range(args.workers)
+            ])
+        exit_code = max(code for code, _ in outcomes)
+        report = merge_reports([report for _, report in outcomes])
+        print(f"\n📊 All workers: {report['summary']['passed_tests']}/{report['summary']['total_tests']} tests passed")
+    else:
+        exit_code, report = run_tester(args.base_url, tty=args.tty, results_path=RESULTS_PATH)
     
-    # Save detailed report
-    report = tester.get_test_report()
-    with open('/app/backend_test_report.json', 'w') as f:
-        json.dump(report, f, indent=2)
+    # Save the summary; per-test results were already streamed to JSONL
+    with open(REPORT_PATH, 'wb') as f:
+        f.write(json_dumps_pretty(report))
     
-    print(f"\n📄 Detailed report saved to: /app/backend_test_report.json")
+    print(f"\n📄 Summary saved to: {REPORT_PATH}")
+    results_files = report.get("results_files") or [report["results_file"]]
+    print(f"📄 Per-test results: {', '.join(results_files)}")
     return exit_code
 
 if __name__ == "__main__":